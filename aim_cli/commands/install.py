@@ -0,0 +1,172 @@
+import shutil
+import typer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Optional
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
+from aim_cli.config import load_config
+from aim_cli.lockfile import (
+    LOCK_FILE_NAME,
+    LockEntry,
+    LockFile,
+    load_lockfile,
+    save_lockfile,
+    manifest_digest,
+    read_install_stamp,
+    write_install_stamp,
+)
+from aim_cli.storage.materialize import LINK_MODES
+from aim_cli.storage.sink import CACHE_MODES
+from aim_cli.commands.model import build_storage, download_with_link_mode
+
+console = Console()
+
+
+def _is_installed(entry: LockEntry, dest: Path, verify: bool) -> bool:
+    stamp = read_install_stamp(dest)
+    if not stamp or stamp.get("ref") != entry.ref:
+        return False
+    if entry.digest and stamp.get("digest") != entry.digest:
+        return False
+    expected = entry.digest or stamp.get("digest")
+    # Unpinned entries installed without --update-lock have no digest to rehash against
+    if verify and expected:
+        return manifest_digest(dest) == expected
+    return True
+
+
+def _install_entry(storage, entry: LockEntry, dest: Path, link_mode: str, compute_digest: bool) -> Optional[str]:
+    """Download one entry into a staging directory next to dest and move it into place once verified."""
+    staging = dest.parent / f".{dest.name}.aim-partial"
+    if staging.exists():
+        shutil.rmtree(staging)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        download_with_link_mode(storage, entry.model, entry.tag, staging, link_mode)
+
+        digest = manifest_digest(staging) if (entry.digest or compute_digest) else None
+        if entry.digest and digest != entry.digest:
+            raise ValueError(f"Digest mismatch for {entry.ref}: expected {entry.digest}, got {digest}")
+        write_install_stamp(staging, entry, digest)
+
+        if dest.exists():
+            shutil.rmtree(dest)
+        staging.rename(dest)
+        return digest
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _record_digests(lock_data: LockFile, lockfile: Path, digests: Dict[str, str]):
+    changed = False
+    for entry in lock_data.models:
+        if not entry.digest and digests.get(entry.ref):
+            entry.digest = digests[entry.ref]
+            changed = True
+    if changed:
+        save_lockfile(lock_data, lockfile)
+        console.print(f"[yellow]Recorded digests in {lockfile}[/yellow]")
+
+
+def install(
+    lockfile: Path = typer.Option(Path(LOCK_FILE_NAME), "--lockfile", "-l", help="Path to the lockfile"),
+    jobs: int = typer.Option(4, "--jobs", "-j", help="Number of models to download concurrently"),
+    link_mode: str = typer.Option("copy", "--link-mode", help=f"How to materialize files from a local/NFS repo: {', '.join(LINK_MODES)}"),
+    verify: bool = typer.Option(False, "--verify", help="Rehash already installed models instead of trusting the install stamp"),
+    force: bool = typer.Option(False, "--force", "-f", help="Replace destinations that exist but do not match the lockfile"),
+    update_lock: bool = typer.Option(False, "--update-lock", help="Record manifest digests for entries that do not pin one"),
+    cache_mode: str = typer.Option(None, "--cache-mode", help=f"Page cache handling for written files: {', '.join(CACHE_MODES)} (default: repo profile or keep)"),
+):
+    """Install every model pinned in a lockfile."""
+    if link_mode not in LINK_MODES:
+        console.print(f"[red]Error: Invalid link mode '{link_mode}'. Must be one of {', '.join(LINK_MODES)}.[/red]")
+        raise typer.Exit(code=1)
+    if cache_mode and cache_mode not in CACHE_MODES:
+        console.print(f"[red]Error: Invalid cache mode '{cache_mode}'. Must be one of {', '.join(CACHE_MODES)}.[/red]")
+        raise typer.Exit(code=1)
+    if not lockfile.exists():
+        console.print(f"[red]Error: Lockfile '{lockfile}' does not exist.[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        lock_data = load_lockfile(lockfile)
+    except Exception as e:
+        console.print(f"[red]Error reading lockfile:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    base_dir = lockfile.resolve().parent
+    config = load_config()
+
+    # Resolve everything before downloading anything
+    pending = []
+    digests = {}
+    for entry in lock_data.models:
+        dest = entry.dest_path(base_dir)
+        if _is_installed(entry, dest, verify):
+            console.print(f"[dim]Skipping {entry.ref} (already installed)[/dim]")
+            if update_lock and not entry.digest:
+                digests[entry.ref] = read_install_stamp(dest).get("digest") or manifest_digest(dest)
+            continue
+        if dest.exists() and any(dest.iterdir()) and not force:
+            console.print(f"[red]Error: '{dest}' exists and does not match {entry.ref}. Use --force to replace it.[/red]")
+            raise typer.Exit(code=1)
+        if not config.get_repo(entry.repo):
+            console.print(f"[bold red]Error:[/bold red] Repo '{entry.repo}' not found.")
+            raise typer.Exit(code=1)
+        pending.append((entry, dest))
+
+    if not pending:
+        if update_lock:
+            _record_digests(lock_data, lockfile, digests)
+        console.print("[green]All models are up to date.[/green]")
+        return
+
+    # One backend (and connection) per repo, shared by all of its entries;
+    # SFTP backends open a channel per worker thread over that connection
+    storages = {}
+    for repo_name in sorted({entry.repo for entry, _ in pending}):
+        try:
+            storage = build_storage(config.get_repo(repo_name), config, {"cache_mode": cache_mode} if cache_mode else None)
+        except Exception as e:
+            console.print(f"[red]Error connecting to repo '{repo_name}':[/red] {e}")
+            raise typer.Exit(code=1)
+        storages[repo_name] = storage
+
+    failed = 0
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        TimeElapsedColumn(),
+        console=console,
+    ) as progress:
+        overall = progress.add_task(f"Installing {len(pending)} model(s)", total=len(pending))
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {}
+            for entry, dest in pending:
+                task = progress.add_task(f"{entry.ref}", total=1)
+                future = executor.submit(
+                    _install_entry, storages[entry.repo], entry, dest, link_mode, update_lock
+                )
+                futures[future] = (entry, task)
+
+            for future in as_completed(futures):
+                entry, task = futures[future]
+                try:
+                    digests[entry.ref] = future.result()
+                    progress.update(task, completed=1, description=f"[green]{entry.ref}[/green]")
+                except Exception as e:
+                    failed += 1
+                    progress.update(task, completed=1, description=f"[red]{entry.ref}: {e}[/red]")
+                progress.advance(overall)
+
+    if update_lock:
+        _record_digests(lock_data, lockfile, digests)
+
+    if failed:
+        console.print(f"[red]{failed} of {len(pending)} model(s) failed to install.[/red]")
+        raise typer.Exit(code=1)
+    console.print(f"[green]Installed {len(pending)} model(s).[/green]")
@@ -3,31 +3,77 @@ import os
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-from aim_cli.config import load_config, RepoConfig
+from typing import Optional
+from aim_cli.config import load_config, RepoConfig, GlobalConfig
 from aim_cli.storage.local import LocalStorage
+from aim_cli.storage.materialize import LINK_MODES
+from aim_cli.storage.sink import CACHE_MODES
 from aim_cli.storage.s3 import S3Storage
 from aim_cli.storage.sftp import SFTPStorage
+from aim_cli.storage.tiered import TieredStorage
+from aim_cli.watch import DEFAULT_MARKER, watch_and_push
 
 app = typer.Typer()
 console = Console()
 
-def get_storage(repo_name: str):
+def build_storage(repo: RepoConfig, config: Optional[GlobalConfig] = None, transfer_overrides: Optional[dict] = None):
+    """
+    Instantiate the storage backend for an already resolved repo config.
+    transfer_overrides replace fields of the repo's transfer profile (e.g. from CLI flags).
+    """
+    if repo.type == "tiered":
+        config = config or load_config()
+        hot_repo = config.get_repo(repo.hot_repo) if repo.hot_repo else None
+        cold_repo = config.get_repo(repo.cold_repo) if repo.cold_repo else None
+        if not hot_repo or hot_repo.type != "local":
+            raise ValueError(f"Tiered repo '{repo.name}' needs hot_repo to name a registered local repo.")
+        if not cold_repo or cold_repo.type not in ("s3", "sftp"):
+            raise ValueError(f"Tiered repo '{repo.name}' needs cold_repo to name a registered s3 or sftp repo.")
+        tier_options = {
+            k: v for k, v in {
+                "hot_capacity_gb": repo.hot_capacity_gb,
+                "promote_after": repo.promote_after,
+                "promote_window_days": repo.promote_window_days,
+                "demote_after_days": repo.demote_after_days,
+            }.items() if v is not None
+        }
+        return TieredStorage(
+            build_storage(hot_repo, config, transfer_overrides),
+            build_storage(cold_repo, config, transfer_overrides),
+            **tier_options,
+        )
+
+    transfer = repo.transfer.model_dump(exclude_none=True) if repo.transfer else {}
+    transfer.update(transfer_overrides or {})
+    if repo.type == "local":
+        return LocalStorage(repo.path, transfer=transfer)
+    elif repo.type == "s3":
+        return S3Storage(repo.path, region=repo.region, access_key=repo.access_key, secret_key=repo.secret_key, transfer=transfer)
+    elif repo.type == "sftp":
+        return SFTPStorage(repo.path, username=repo.username, password=repo.password, transfer=transfer)
+    else:
+        raise ValueError(f"Unknown storage type '{repo.type}'.")
+
+def get_storage(repo_name: str, transfer_overrides: Optional[dict] = None):
     config = load_config()
     repo = config.get_repo(repo_name)
     if not repo:
         console.print(f"[bold red]Error:[/bold red] Repo '{repo_name}' not found.")
         raise typer.Exit(code=1)
     
-    if repo.type == "local":
-        return LocalStorage(repo.path)
-    elif repo.type == "s3":
-        return S3Storage(repo.path, region=repo.region, access_key=repo.access_key, secret_key=repo.secret_key)
-    elif repo.type == "sftp":
-        return SFTPStorage(repo.path, username=repo.username, password=repo.password)
-    else:
-        console.print(f"[bold red]Error:[/bold red] Unknown storage type '{repo.type}'.")
+    try:
+        return build_storage(repo, config, transfer_overrides)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
         raise typer.Exit(code=1)
 
+def download_with_link_mode(storage, model: str, tag: str, dest: Path, link_mode: str = "copy") -> str:
+    """Download a version, linking instead of copying when the backend supports it. Returns the mode used."""
+    if isinstance(storage, (LocalStorage, TieredStorage)):
+        return storage.download_version(model, tag, dest, link_mode=link_mode)
+    storage.download_version(model, tag, dest)
+    return "copy"
+
 @app.command("list")
 def list_models(repo: str):
     """List models in a repository."""
@@ -59,10 +105,33 @@ def push(
     repo: str, 
     model: str, 
     path: Path = typer.Argument(..., help="Local path to model directory"), 
-    tag: str = typer.Option(..., help="Version tag (e.g. v1, 2023-10-01)")
+    tag: str = typer.Option(..., help="Version tag (e.g. v1, 2023-10-01)"),
+    watch: bool = typer.Option(False, "--watch", help="Upload files while they are being written and commit when the marker appears"),
+    marker: str = typer.Option(DEFAULT_MARKER, help="Completion marker file (relative to path) that ends --watch"),
+    settle: float = typer.Option(2.0, help="Seconds a file must stay unchanged before it is uploaded (--watch)"),
+    timeout: float = typer.Option(None, help="Give up watching after this many seconds (--watch)"),
 ):
     """Push a local directory as a new version of a model."""
     storage = get_storage(repo)
+    if watch:
+        console.print(f"Watching '{path}' for {repo}/{model}:{tag} (commit on '{marker}') ...")
+        try:
+            uploaded = watch_and_push(
+                storage, model, tag, path,
+                marker=marker,
+                settle=settle,
+                timeout=timeout,
+                on_upload=lambda rel: console.print(f"  uploaded {rel}"),
+            )
+            console.print(f"[green]Successfully pushed {model}:{tag} ({len(uploaded)} files)[/green]")
+        except KeyboardInterrupt:
+            console.print("[yellow]Watch interrupted, staged upload discarded.[/yellow]")
+            raise typer.Exit(code=130)
+        except Exception as e:
+            console.print(f"[red]Error uploading:[/red] {e}")
+            raise typer.Exit(code=1)
+        return
+
     if not path.exists():
         console.print(f"[red]Error: Local path '{path}' does not exist.[/red]")
         raise typer.Exit(code=1)
@@ -80,14 +149,27 @@ def pull(
     repo: str, 
     model: str, 
     dest: Path = typer.Argument(..., help="Destination directory"), 
-    tag: str = typer.Option(..., help="Version tag to pull")
+    tag: str = typer.Option(..., help="Version tag to pull"),
+    link_mode: str = typer.Option("copy", "--link-mode", help=f"How to materialize files from a local/NFS repo: {', '.join(LINK_MODES)}"),
+    cache_mode: str = typer.Option(None, "--cache-mode", help=f"Page cache handling for written files: {', '.join(CACHE_MODES)} (default: repo profile or keep)"),
 ):
     """Pull a model version to a local directory."""
-    storage = get_storage(repo)
+    if link_mode not in LINK_MODES:
+        console.print(f"[red]Error: Invalid link mode '{link_mode}'. Must be one of {', '.join(LINK_MODES)}.[/red]")
+        raise typer.Exit(code=1)
+    if cache_mode and cache_mode not in CACHE_MODES:
+        console.print(f"[red]Error: Invalid cache mode '{cache_mode}'. Must be one of {', '.join(CACHE_MODES)}.[/red]")
+        raise typer.Exit(code=1)
+
+    storage = get_storage(repo, {"cache_mode": cache_mode} if cache_mode else None)
     
     console.print(f"Downloading {repo}/{model}:{tag} to '{dest}' ...")
     try:
-        storage.download_version(model, tag, dest)
+        if not isinstance(storage, (LocalStorage, TieredStorage)) and link_mode not in ("copy", "auto"):
+            console.print(f"[yellow]Link mode '{link_mode}' is only supported for local repos, copying instead.[/yellow]")
+        used_mode = download_with_link_mode(storage, model, tag, dest, link_mode)
+        if used_mode != "copy":
+            console.print(f"Materialized files with {used_mode} (read-only).")
         console.print(f"[green]Successfully pulled {model}:{tag}[/green]")
     except Exception as e:
         console.print(f"[red]Error downloading:[/red] {e}")
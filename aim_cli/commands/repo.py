@@ -1,34 +1,103 @@
 import typer
 import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
 from rich.console import Console
 from rich.table import Table
-from aim_cli.config import load_config, save_config, RepoConfig
+from aim_cli.config import load_config, save_config, RepoConfig, TransferConfig
+from aim_cli.commands.model import get_storage, build_storage
+from aim_cli.storage.tiered import TieredStorage
 
 app = typer.Typer()
 console = Console()
 
+# Profiles tried by `repo autotune`, from library defaults towards more parallelism/larger buffers
+AUTOTUNE_CANDIDATES = {
+    "local": [
+        {"concurrency": 1},
+        {"concurrency": 4},
+        {"concurrency": 8},
+        {"concurrency": 16},
+    ],
+    "s3": [
+        {"concurrency": 4, "part_size_mb": 8},
+        {"concurrency": 10, "part_size_mb": 16},
+        {"concurrency": 16, "part_size_mb": 32},
+        {"concurrency": 32, "part_size_mb": 64, "chunk_size_kb": 1024},
+    ],
+    "sftp": [
+        {"concurrency": 1},
+        {"concurrency": 1, "sftp_window_size_mb": 16, "buffer_size_mb": 4},
+        {"concurrency": 4, "sftp_window_size_mb": 16, "buffer_size_mb": 4},
+        {"concurrency": 8, "sftp_window_size_mb": 64, "buffer_size_mb": 8},
+    ],
+}
+AUTOTUNE_MODEL = ".aim-autotune"
+
+
+def _timed_round_trip(storage, version: str, source: Path, dest: Path):
+    """Push and pull source once as version, returning (upload_seconds, download_seconds). Always cleans up."""
+    try:
+        start = time.perf_counter()
+        storage.upload_version(AUTOTUNE_MODEL, version, source)
+        upload_time = time.perf_counter() - start
+        start = time.perf_counter()
+        storage.download_version(AUTOTUNE_MODEL, version, dest)
+        download_time = time.perf_counter() - start
+        return upload_time, download_time
+    finally:
+        # Also reached when the upload itself fails part way, leaving a partial version behind
+        try:
+            storage.delete_version(AUTOTUNE_MODEL, version)
+        except Exception:
+            pass
+        shutil.rmtree(dest, ignore_errors=True)
+
 @app.command()
 def create(
     name: str = typer.Argument(..., help="Name of the repository to create"),
-    type: str = typer.Option(..., help="Type of storage: 'local' or 's3'"),
-    path: str = typer.Option(..., help="Path or URL for the storage"),
+    type: str = typer.Option(..., help="Type of storage: 'local', 's3', 'sftp' or 'tiered'"),
+    path: str = typer.Option(None, help="Path or URL for the storage (defaults to the hot repo path for tiered)"),
     region: str = typer.Option(None, help="AWS Region (for S3 only)"),
     access_key: str = typer.Option(None, help="AWS Access Key (for S3 only)"),
     secret_key: str = typer.Option(None, help="AWS Secret Key (for S3 only)"),
     username: str = typer.Option(None, help="Username (for SFTP)"),
     password: str = typer.Option(None, help="Password (for SFTP)"),
+    hot_repo: str = typer.Option(None, help="Local/NFS repo used as the fast tier (for tiered only)"),
+    cold_repo: str = typer.Option(None, help="S3/SFTP repo used as the cold tier (for tiered only)"),
+    hot_capacity_gb: float = typer.Option(None, help="Hot tier capacity budget in GiB (for tiered only)"),
+    promote_after: int = typer.Option(None, help="Pulls within the promote window before a version is promoted (for tiered only)"),
+    demote_after_days: float = typer.Option(None, help="Days without pulls before a hot version is demoted (for tiered only)"),
 ):
     """Register a new model repository."""
-    if type not in ["local", "s3", "sftp"]:
-        console.print(f"[bold red]Error:[/bold red] Invalid type '{type}'. Must be 'local', 's3', or 'sftp'.")
+    if type not in ["local", "s3", "sftp", "tiered"]:
+        console.print(f"[bold red]Error:[/bold red] Invalid type '{type}'. Must be 'local', 's3', 'sftp', or 'tiered'.")
 
         raise typer.Exit(code=1)
 
+    config = load_config()
+    if type == "tiered":
+        hot = config.get_repo(hot_repo) if hot_repo else None
+        cold = config.get_repo(cold_repo) if cold_repo else None
+        if not hot or hot.type != "local":
+            console.print("[bold red]Error:[/bold red] --hot-repo must name a registered local repo.")
+            raise typer.Exit(code=1)
+        if not cold or cold.type not in ("s3", "sftp"):
+            console.print("[bold red]Error:[/bold red] --cold-repo must name a registered s3 or sftp repo.")
+            raise typer.Exit(code=1)
+        path = path or hot.path
+    elif not path:
+        console.print("[bold red]Error:[/bold red] --path is required.")
+        raise typer.Exit(code=1)
+
 
     if type == "sftp" and not password:
         password = typer.prompt("SFTP Password", hide_input=True)
 
-    config = load_config()
     if config.get_repo(name):
         console.print(f"[bold red]Error:[/bold red] Repo '{name}' already exists.")
         raise typer.Exit(code=1)
@@ -41,7 +110,12 @@ def create(
         access_key=access_key,
         secret_key=secret_key,
         username=username,
-        password=password
+        password=password,
+        hot_repo=hot_repo,
+        cold_repo=cold_repo,
+        hot_capacity_gb=hot_capacity_gb,
+        promote_after=promote_after,
+        demote_after_days=demote_after_days,
     )
     
     config.add_repo(new_repo)
@@ -110,3 +184,139 @@ def delete(name: str):
         console.print(f"[green]Repo '{name}' deleted.[/green]")
     else:
         console.print(f"[red]Repo '{name}' not found.[/red]")
+
+def _get_tiered_storage(name: str) -> TieredStorage:
+    storage = get_storage(name)
+    if not isinstance(storage, TieredStorage):
+        console.print(f"[red]Repo '{name}' is not a tiered repo.[/red]")
+        raise typer.Exit(code=1)
+    return storage
+
+@app.command("tier-status")
+def tier_status(name: str):
+    """Show pull statistics and tier placement for a tiered repository."""
+    storage = _get_tiered_storage(name)
+
+    for key in storage.rebalance(dry_run=True):
+        console.print(f"[yellow]{key} is due for demotion (run 'aim repo tier-rebalance {name}')[/yellow]")
+
+    table = Table(title=f"Tiers in {name}")
+    table.add_column("Version", style="cyan")
+    table.add_column("Tier", style="magenta")
+    table.add_column("Recent Pulls", justify="right")
+    table.add_column("Last Pull", style="green")
+    table.add_column("Size", justify="right")
+
+    for key, entry in sorted(storage.tier_status().items()):
+        last = entry.get("last_access")
+        size = entry.get("size")
+        table.add_row(
+            key,
+            "hot" if entry["hot"] else "cold",
+            str(len(entry.get("pulls", []))),
+            datetime.fromtimestamp(last).strftime("%Y-%m-%d %H:%M") if last else "-",
+            f"{size / 1024 ** 3:.2f} GiB" if size and entry["hot"] else "-",
+        )
+    console.print(table)
+
+@app.command("tier-rebalance")
+def tier_rebalance(name: str):
+    """Demote idle versions and enforce the hot capacity budget of a tiered repository now."""
+    storage = _get_tiered_storage(name)
+    demoted = storage.rebalance()
+    for key in demoted:
+        console.print(f"[yellow]Demoted {key} from the hot tier[/yellow]")
+    if not demoted:
+        console.print("[green]Nothing to demote.[/green]")
+
+def _write_synthetic_model(path: Path, size_mb: int, files: int):
+    """Write incompressible files so compression or dedup cannot flatter a profile."""
+    path.mkdir(parents=True, exist_ok=True)
+    per_file = max(1, size_mb * 1024 * 1024 // files)
+    for i in range(files):
+        with open(path / f"shard-{i}.bin", "wb") as f:
+            remaining = per_file
+            while remaining > 0:
+                chunk = min(remaining, 4 * 1024 * 1024)
+                f.write(os.urandom(chunk))
+                remaining -= chunk
+
+@app.command()
+def autotune(
+    name: str,
+    size_mb: int = typer.Option(256, help="Total size of the synthetic model per trial"),
+    files: int = typer.Option(4, help="Number of files the synthetic model is split into"),
+    trials: int = typer.Option(3, min=2, help="Timed runs per profile, after one discarded warm-up run"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report results, do not update the config"),
+):
+    """Benchmark transfer profiles against a repository and save the fastest one."""
+    config = load_config()
+    repo = config.get_repo(name)
+    if not repo:
+        console.print(f"[red]Repo '{name}' not found.[/red]")
+        raise typer.Exit(code=1)
+    if repo.type not in AUTOTUNE_CANDIDATES:
+        console.print(f"[red]Autotune is not supported for '{repo.type}' repos. Tune its underlying repos instead.[/red]")
+        raise typer.Exit(code=1)
+
+    candidates = AUTOTUNE_CANDIDATES[repo.type]
+    swept = {k for c in candidates for k in c}
+    # Keep settings the sweep does not touch, such as the S3 endpoint
+    current = repo.transfer.model_dump(exclude_none=True) if repo.transfer else {}
+    base = {k: v for k, v in current.items() if k not in swept}
+
+    table = Table(title=f"Autotune {name} ({size_mb} MB in {files} file(s), median of {trials} runs)")
+    table.add_column("Profile", style="cyan")
+    table.add_column("Upload MB/s", justify="right")
+    table.add_column("Download MB/s", justify="right")
+
+    best, best_time = None, None
+    last_storage = None
+    with tempfile.TemporaryDirectory(prefix="aim-autotune-") as tmp:
+        source = Path(tmp) / "source"
+        _write_synthetic_model(source, size_mb, files)
+
+        for i, candidate in enumerate(candidates):
+            profile = {**base, **candidate}
+            label = ", ".join(f"{k}={v}" for k, v in candidate.items())
+            console.print(f"Trying {label} ...")
+            try:
+                storage = build_storage(repo.model_copy(update={"transfer": TransferConfig(**profile)}), config)
+                last_storage = storage
+                # The first run warms connections, caches and the server side; it is not timed
+                runs = []
+                for run in range(trials + 1):
+                    version = f"trial-{os.getpid()}-{i}-{run}"
+                    runs.append(_timed_round_trip(storage, version, source, Path(tmp) / version))
+                runs = runs[1:]
+            except Exception as e:
+                console.print(f"[yellow]Profile {label} failed:[/yellow] {e}")
+                table.add_row(label, "failed", "failed")
+                continue
+
+            # Medians keep a single slow or lucky run from picking the profile
+            upload_time = statistics.median(u for u, _ in runs)
+            download_time = statistics.median(d for _, d in runs)
+            total_time = statistics.median(u + d for u, d in runs)
+            table.add_row(label, f"{size_mb / upload_time:.1f}", f"{size_mb / download_time:.1f}")
+            if best_time is None or total_time < best_time:
+                best, best_time = profile, total_time
+
+        # Drop the now empty autotune model
+        if last_storage is not None:
+            try:
+                last_storage.delete_model(AUTOTUNE_MODEL)
+            except Exception:
+                pass
+
+    console.print(table)
+    if best is None:
+        console.print("[red]No profile completed successfully.[/red]")
+        raise typer.Exit(code=1)
+
+    console.print(f"Best profile: {', '.join(f'{k}={v}' for k, v in best.items())}")
+    if dry_run:
+        return
+    repo.transfer = TransferConfig(**best)
+    save_config(config)
+    console.print(f"[green]Saved transfer profile for '{name}'.[/green]")
@@ -10,9 +10,33 @@ load_dotenv()
 
 CONFIG_FILE_NAME = "model_repos.yaml"
 
+class TransferConfig(BaseModel):
+    """Per-repo transfer tuning. Unset fields keep the backend library defaults."""
+    # Files (local, SFTP) or multipart parts (S3) transferred in parallel
+    concurrency: Optional[int] = None
+    # S3 multipart part size; objects larger than this are split
+    part_size_mb: Optional[int] = None
+    # S3 read/write chunk size
+    chunk_size_kb: Optional[int] = None
+    # S3 download buffering (queued chunks) and SFTP file buffer
+    buffer_size_mb: Optional[int] = None
+    sftp_window_size_mb: Optional[int] = None
+    sftp_max_packet_kb: Optional[int] = None
+    s3_max_pool_connections: Optional[int] = None
+    # S3-compatible endpoints (MinIO, Ceph RGW, ...)
+    s3_endpoint_url: Optional[str] = None
+    # Downloads: page cache handling ("keep", "drop" or "warm"), write coalescing,
+    # fsync batching and fallocate preallocation of destination files
+    cache_mode: Optional[Literal["keep", "drop", "warm"]] = None
+    write_block_mb: Optional[int] = None
+    fsync_batch_mb: Optional[int] = None
+    preallocate: Optional[bool] = None
+
+
 class RepoConfig(BaseModel):
     name: str
-    type: Literal["local", "s3", "sftp"]
+    type: Literal["local", "s3", "sftp", "tiered"]
+    # For tiered repos this is informational; data lives in hot_repo/cold_repo
     path: str
     region: Optional[str] = None
     # Passwords/Secrets are excluded from YAML dump but loaded from Env
@@ -20,6 +44,14 @@ class RepoConfig(BaseModel):
     secret_key: Optional[str] = Field(None, exclude=True)
     username: Optional[str] = None
     password: Optional[str] = Field(None, exclude=True)
+    # Tiered repos: names of a local/NFS repo (hot) and an S3/SFTP repo (cold)
+    hot_repo: Optional[str] = None
+    cold_repo: Optional[str] = None
+    hot_capacity_gb: Optional[float] = None
+    promote_after: Optional[int] = None
+    promote_window_days: Optional[float] = None
+    demote_after_days: Optional[float] = None
+    transfer: Optional[TransferConfig] = None
 
     def load_secrets(self):
         """Populate secrets from environment variables based on convention."""
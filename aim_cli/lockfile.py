@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import yaml
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
+from pathlib import Path
+
+LOCK_FILE_NAME = "aim.lock"
+# Written into each installed directory to recognise an up-to-date install without rehashing
+INSTALL_STAMP_NAME = ".aim-install.json"
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def parse_ref(ref: str) -> Tuple[str, str, str]:
+    """Split a 'repo/model:tag' reference into its parts."""
+    if "/" not in ref or ":" not in ref:
+        raise ValueError(f"Invalid model reference '{ref}'. Expected 'repo/model:tag'.")
+    repo, rest = ref.split("/", 1)
+    model, tag = rest.rsplit(":", 1)
+    if not repo or not model or not tag:
+        raise ValueError(f"Invalid model reference '{ref}'. Expected 'repo/model:tag'.")
+    return repo, model, tag
+
+
+class LockEntry(BaseModel):
+    ref: str
+    # Defaults to models/<model> next to the lockfile
+    dest: Optional[str] = None
+    # Expected manifest digest, e.g. "sha256:ab12..."
+    digest: Optional[str] = None
+
+    @property
+    def repo(self) -> str:
+        return parse_ref(self.ref)[0]
+
+    @property
+    def model(self) -> str:
+        return parse_ref(self.ref)[1]
+
+    @property
+    def tag(self) -> str:
+        return parse_ref(self.ref)[2]
+
+    def dest_path(self, base_dir: Path) -> Path:
+        return base_dir / (self.dest or f"models/{self.model}")
+
+
+class LockFile(BaseModel):
+    models: List[LockEntry] = Field(default_factory=list)
+
+
+def load_lockfile(path: Path) -> LockFile:
+    with open(path, "r") as f:
+        data = yaml.safe_load(f) or {}
+    lock = LockFile(**data)
+    # Validate references up front rather than halfway through an install
+    base_dir = Path(path).resolve().parent
+    seen = {}
+    for entry in lock.models:
+        parse_ref(entry.ref)
+        # Two entries sharing a destination would clobber each other's staging directory
+        dest = entry.dest_path(base_dir).resolve()
+        if dest in seen:
+            raise ValueError(f"Entries '{seen[dest]}' and '{entry.ref}' both install into '{dest}'. Set distinct 'dest' values.")
+        seen[dest] = entry.ref
+    return lock
+
+
+def save_lockfile(lock: LockFile, path: Path):
+    with open(path, "w") as f:
+        data = lock.model_dump(mode="json", exclude_none=True)
+        yaml.dump(data, f, sort_keys=False)
+
+
+def manifest_digest(path: Path) -> str:
+    """
+    Digest of a materialized version: sha256 over the sorted (relative path, size, content sha256)
+    of every file, so it is independent of the backend it was downloaded from.
+    """
+    path = Path(path)
+    lines = []
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            full_path = Path(root) / file
+            rel_path = full_path.relative_to(path).as_posix()
+            if rel_path == INSTALL_STAMP_NAME:
+                continue
+            h = hashlib.sha256()
+            with open(full_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    h.update(chunk)
+            lines.append(f"{rel_path}\t{full_path.stat().st_size}\t{h.hexdigest()}\n")
+
+    manifest = hashlib.sha256()
+    for line in sorted(lines):
+        manifest.update(line.encode("utf-8"))
+    return f"sha256:{manifest.hexdigest()}"
+
+
+def read_install_stamp(dest: Path) -> Optional[dict]:
+    stamp = Path(dest) / INSTALL_STAMP_NAME
+    if not stamp.exists():
+        return None
+    try:
+        with open(stamp, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_install_stamp(dest: Path, entry: LockEntry, digest: Optional[str]):
+    with open(Path(dest) / INSTALL_STAMP_NAME, "w") as f:
+        json.dump({"ref": entry.ref, "digest": digest}, f)
@@ -2,12 +2,13 @@ import typer
 import yaml
 from pathlib import Path
 from aim_cli.config import load_config, save_config, RepoConfig, GlobalConfig
-from aim_cli.commands import repo, model
+from aim_cli.commands import repo, model, install
 
 app = typer.Typer(help="AI Model Manager CLI")
 
 app.add_typer(repo.app, name="repo", help="Manage model repositories")
 app.add_typer(model.app, name="model", help="Manage models and versions")
+app.command()(install.install)
 
 @app.command()
 def info():
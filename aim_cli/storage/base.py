@@ -1,11 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional
 from pathlib import Path
+from .sink import LocalWriteSink
+
+class StagedVersion:
+    """A version being uploaded piece by piece; invisible to readers until committed."""
+
+    def __init__(self, model_name: str, version: str, location: str):
+        self.model_name = model_name
+        self.version = version
+        # Backend specific staging directory/prefix
+        self.location = location
+
 
 class StorageBackend(ABC):
     def __init__(self, path: str, **kwargs):
         self.path = path
         self.config = kwargs
+        # Tuning knobs from RepoConfig.transfer, as a plain dict of the fields that are set
+        self.transfer = kwargs.get("transfer") or {}
+
+    def open_sink(self) -> LocalWriteSink:
+        """Local write sink for downloads, configured from the repo's transfer profile."""
+        return LocalWriteSink.from_transfer(self.transfer)
 
     @abstractmethod
     def list_models(self) -> List[str]:
@@ -36,3 +53,39 @@ class StorageBackend(ABC):
     def delete_version(self, model_name: str, version: str):
         """Delete a specific version of a model."""
         pass
+
+    # Staged uploads: files are added one at a time to a hidden staging area and the
+    # version is published in a single step by commit_version.
+
+    @abstractmethod
+    def begin_version(self, model_name: str, version: str) -> StagedVersion:
+        """Start a staged upload of a new version."""
+        pass
+
+    @abstractmethod
+    def upload_file(self, staged: StagedVersion, rel_path: str, local_file: Path):
+        """Upload (or replace) a single file of a staged version."""
+        pass
+
+    @abstractmethod
+    def open_file(self, staged: StagedVersion, rel_path: str, size: Optional[int] = None) -> BinaryIO:
+        """
+        Open a writable binary stream for a file of a staged version; data is committed on close().
+        size is the expected file size when known, so backends can plan the upload (e.g. S3 part sizes).
+        """
+        pass
+
+    @abstractmethod
+    def delete_file(self, staged: StagedVersion, rel_path: str):
+        """Remove a file from a staged version."""
+        pass
+
+    @abstractmethod
+    def commit_version(self, staged: StagedVersion):
+        """Publish a staged version under its final name."""
+        pass
+
+    @abstractmethod
+    def abort_version(self, staged: StagedVersion):
+        """Discard a staged version."""
+        pass
@@ -1,8 +1,11 @@
 import shutil
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-from .base import StorageBackend
+from typing import BinaryIO, List, Optional
+from .base import StorageBackend, StagedVersion
+from .materialize import materialize_tree
 
 class LocalStorage(StorageBackend):
     def __init__(self, path: str, **kwargs):
@@ -49,10 +52,56 @@ class LocalStorage(StorageBackend):
         if not local_path.exists():
              raise FileNotFoundError(f"Source path {local_path} does not exist.")
 
-        # Copy directory
-        shutil.copytree(local_path, dest_path)
+        # Copy directory; copytree creates each directory before copying into it,
+        # so the file copies themselves can be spread over a pool (helps on NFS)
+        with ThreadPoolExecutor(max_workers=max(1, self.transfer.get("concurrency", 1))) as executor:
+            futures = []
+            shutil.copytree(
+                local_path,
+                dest_path,
+                copy_function=lambda src, dst: futures.append(executor.submit(shutil.copy2, src, dst)),
+            )
+            for future in futures:
+                future.result()
 
-    def download_version(self, model_name: str, version: str, dest_path: Path):
+    def begin_version(self, model_name: str, version: str) -> StagedVersion:
+        model_path = self._model_path(model_name)
+        if (model_path / version).exists():
+            raise FileExistsError(f"Version {version} for model {model_name} already exists.")
+        # Dot-prefixed, so list/versions never show it
+        staging = model_path / f".staging-{version}-{uuid.uuid4().hex[:8]}"
+        staging.mkdir(parents=True)
+        return StagedVersion(model_name, version, str(staging))
+
+    def upload_file(self, staged: StagedVersion, rel_path: str, local_file: Path):
+        target = Path(staged.location) / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(local_file, target)
+
+    def open_file(self, staged: StagedVersion, rel_path: str, size: Optional[int] = None) -> BinaryIO:
+        target = Path(staged.location) / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return open(target, "wb")
+
+    def delete_file(self, staged: StagedVersion, rel_path: str):
+        target = Path(staged.location) / rel_path
+        if target.exists():
+            target.unlink()
+
+    def commit_version(self, staged: StagedVersion):
+        dest_path = self._model_path(staged.model_name) / staged.version
+        try:
+            # rename() of a directory is atomic and refuses a non-empty target
+            os.rename(staged.location, dest_path)
+        except OSError:
+            if dest_path.exists():
+                raise FileExistsError(f"Version {staged.version} for model {staged.model_name} already exists.")
+            raise
+
+    def abort_version(self, staged: StagedVersion):
+        shutil.rmtree(staged.location, ignore_errors=True)
+
+    def download_version(self, model_name: str, version: str, dest_path: Path, link_mode: str = "copy") -> str:
         source_path = self._model_path(model_name) / version
         if not source_path.exists():
             raise FileNotFoundError(f"Version {version} for model {model_name} not found.")
@@ -63,8 +112,11 @@ class LocalStorage(StorageBackend):
              if any(dest_path.iterdir()):
                  raise FileExistsError(f"Destination {dest_path} is not empty.")
         
-        # copytree requires dest not to exist usually, or dirs_exist_ok in newer python
-        shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
+        # Same filesystem/NFS mount: link or clone instead of byte-copying when asked to
+        with self.open_sink() as sink:
+            return materialize_tree(
+                source_path, dest_path, link_mode, concurrency=self.transfer.get("concurrency", 1), sink=sink
+            )
 
     def delete_model(self, model_name: str):
         model_path = self._model_path(model_name)
@@ -0,0 +1,187 @@
+import os
+import shutil
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from .sink import LocalWriteSink
+
+LINK_MODES = ("copy", "hardlink", "symlink", "reflink", "auto")
+
+# Linux ioctl for cloning a whole file (btrfs, XFS with reflink=1, bcachefs, ...)
+FICLONE = 0x40049409
+
+_WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+
+def _reflink(src: Path, dst: Path):
+    """Clone src into dst sharing the same extents. Raises OSError if unsupported."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(f"reflink is not supported on {sys.platform}")
+
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.unlink(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _make_read_only(path: Path):
+    try:
+        mode = os.stat(path).st_mode
+        os.chmod(path, mode & ~_WRITE_BITS)
+    except PermissionError:
+        # Not our file (e.g. NFS share owned by the admin); its owner controls the mode
+        pass
+
+
+def probe_link_mode(source: Path, dest: Path) -> str:
+    """Pick the cheapest mode supported between the source and destination filesystems."""
+    dest.mkdir(parents=True, exist_ok=True)
+    sample = next((p for p in source.rglob("*") if p.is_file()), None)
+    if sample is None:
+        return "copy"
+
+    probe = dest / ".aim-link-probe"
+    try:
+        _reflink(sample, probe)
+        return "reflink"
+    except OSError:
+        pass
+    finally:
+        if probe.exists():
+            probe.unlink()
+
+    if os.stat(source).st_dev == os.stat(dest).st_dev:
+        try:
+            os.link(sample, probe)
+            return "hardlink"
+        except OSError:
+            pass
+        finally:
+            if probe.exists():
+                probe.unlink()
+    return "copy"
+
+
+def check_link_mode(source: Path, dest: Path, mode: str):
+    """Fail before anything is written if mode cannot link files from source into dest."""
+    if mode not in ("reflink", "hardlink"):
+        return
+    sample = next((p for p in Path(source).rglob("*") if p.is_file()), None)
+    if sample is None:
+        return
+
+    dest.mkdir(parents=True, exist_ok=True)
+    probe = dest / ".aim-link-probe"
+    try:
+        materialize_file(sample, probe, mode)
+    except OSError as e:
+        raise OSError(f"Link mode '{mode}' is not supported from '{source}' to '{dest}': {e}") from e
+    finally:
+        if probe.exists():
+            probe.unlink()
+
+
+def _copy_through_sink(src: Path, dst: Path, sink: LocalWriteSink):
+    def fill(f):
+        with open(src, "rb") as fsrc:
+            shutil.copyfileobj(fsrc, f, sink.write_block)
+
+    sink.download(dst, os.stat(src).st_size, fill)
+    shutil.copystat(src, dst)
+
+
+def materialize_file(src: Path, dst: Path, mode: str, sink: Optional[LocalWriteSink] = None):
+    if mode == "copy":
+        if sink is not None:
+            _copy_through_sink(src, dst, sink)
+        else:
+            shutil.copy2(src, dst)
+    elif mode == "reflink":
+        _reflink(src, dst)
+    elif mode == "hardlink":
+        os.link(src, dst)
+    elif mode == "symlink":
+        os.symlink(src.resolve(), dst)
+    else:
+        raise ValueError(f"Unknown link mode '{mode}'. Must be one of {', '.join(LINK_MODES)}.")
+
+
+def materialize_tree(
+    source: Path,
+    dest: Path,
+    mode: str = "copy",
+    read_only: Optional[bool] = None,
+    concurrency: int = 1,
+    sink: Optional[LocalWriteSink] = None,
+) -> str:
+    """
+    Materialize the directory tree at source into dest using the given link mode.
+    Returns the mode actually used ('auto' resolves to reflink, hardlink or copy).
+
+    Files sharing storage with the repo (hardlink/symlink/reflink) are made read-only
+    by default so an in-place edit cannot silently change an immutable version.
+    Copies go through sink when one is given.
+    """
+    if mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{mode}'. Must be one of {', '.join(LINK_MODES)}.")
+
+    source = Path(source)
+    dest = Path(dest)
+    if mode == "auto":
+        mode = probe_link_mode(source, dest)
+    else:
+        check_link_mode(source, dest, mode)
+    if read_only is None:
+        read_only = mode != "copy"
+
+    def place(src_file: Path, dst_file: Path):
+        materialize_file(src_file, dst_file, mode, sink)
+        if read_only:
+            # Hardlinks share the inode and symlinks resolve to the repo file,
+            # so this also protects the stored version itself.
+            _make_read_only(dst_file if mode != "symlink" else src_file)
+
+    created_dirs = []
+    placed = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = []
+            for root, dirs, files in os.walk(source):
+                rel_root = Path(root).relative_to(source)
+                target_dir = dest / rel_root
+                if not target_dir.exists():
+                    target_dir.mkdir(parents=True)
+                    created_dirs.append(target_dir)
+                for file in files:
+                    dst_file = target_dir / file
+                    futures.append((executor.submit(place, Path(root) / file, dst_file), dst_file))
+            errors = []
+            for future, dst_file in futures:
+                if future.exception() is None:
+                    placed.append(dst_file)
+                else:
+                    errors.append(future.exception())
+            if errors:
+                raise errors[0]
+    except BaseException:
+        # Leave dest as we found it so a retry is not refused as "not empty"
+        for dst_file in placed:
+            try:
+                os.unlink(dst_file)
+            except OSError:
+                pass
+        for directory in reversed(created_dirs):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        raise
+    return mode
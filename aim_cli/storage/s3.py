@@ -1,14 +1,144 @@
+import io
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
-from .base import StorageBackend
+from typing import BinaryIO, List, Optional
+from .base import StorageBackend, StagedVersion
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
 except ImportError:
     boto3 = None
 
+MB = 1024 * 1024
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * MB
+DEFAULT_PART_SIZE_MB = 8
+DEFAULT_PARTS_IN_FLIGHT = 4
+# S3 multipart limits: at most 10,000 parts of at most 5 GiB each
+MAX_PARTS = 10000
+MAX_PART_SIZE = 5 * 1024 * MB
+# Without a size hint, the part size doubles after every this many parts
+PART_SIZE_GROWTH_INTERVAL = 1000
+# Versions are published by writing {model}/.aim-commits/{version} after all of their objects.
+# S3 has no rename, so this single final write is what makes a version visible. Models without
+# any .aim-commits/ object predate markers; their version prefixes are read as committed until
+# the next push adopts them.
+COMMITS_DIR = ".aim-commits"
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Writable stream uploading to a single S3 object.
+
+    Full parts are handed to background threads as soon as they fill up. At most
+    `max_in_flight` parts are queued or uploading at once, so memory stays bounded at
+    roughly (max_in_flight + 1) * part_size; write() blocks when the limit is reached.
+    Objects smaller than one part are sent with a single put_object on close().
+
+    S3 accepts at most MAX_PARTS parts. Pass the expected size to S3Storage.open_file so
+    the part size is chosen up front; otherwise it doubles every PART_SIZE_GROWTH_INTERVAL
+    parts (which also raises the memory bound for very large objects).
+    """
+
+    def __init__(self, s3, bucket: str, key: str, part_size: int, max_in_flight: int):
+        super().__init__()
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._futures = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        view = memoryview(data)
+        self._buffer += view
+        self._position += view.nbytes
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            self._submit(part)
+        return view.nbytes
+
+    def _submit(self, data: bytes):
+        # Surface failures of earlier parts instead of buffering more data
+        for future in self._futures:
+            if future.done() and future.exception():
+                raise future.exception()
+        part_number = len(self._futures) + 1
+        if part_number > MAX_PARTS:
+            raise ValueError(
+                f"'{self.key}' needs more than {MAX_PARTS} parts of up to {self.part_size // MB} MB, "
+                f"the S3 limit. Pass its expected size when opening it."
+            )
+        if self._upload_id is None:
+            resp = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = resp["UploadId"]
+
+        self._slots.acquire()
+        future = self._executor.submit(self._upload_part, part_number, data)
+        future.add_done_callback(lambda f: self._slots.release())
+        self._futures.append(future)
+        if part_number % PART_SIZE_GROWTH_INTERVAL == 0:
+            # Parts may differ in size, so keep ahead of the part limit for unknown sizes
+            self.part_size = min(self.part_size * 2, MAX_PART_SIZE)
+
+    def _upload_part(self, part_number: int, data: bytes) -> dict:
+        resp = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=part_number, Body=data
+        )
+        return {"PartNumber": part_number, "ETag": resp["ETag"]}
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+            else:
+                if self._buffer:
+                    self._submit(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.s3.complete_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, MultipartUpload={"Parts": parts}
+                )
+        except BaseException:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def abort(self):
+        """Drop everything written so far without creating the object."""
+        if self.closed:
+            return
+        self._executor.shutdown(wait=True)
+        if self._upload_id is not None:
+            # Incomplete multipart uploads are billed until aborted
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            self._upload_id = None
+        self._buffer = bytearray()
+        super().close()
+
 class S3Storage(StorageBackend):
     def __init__(self, path: str, **kwargs):
         super().__init__(path, **kwargs)
@@ -27,12 +157,32 @@ class S3Storage(StorageBackend):
             self.prefix += "/"
 
         # Initialize boto3 client
+        concurrency = self.transfer.get("concurrency")
+        # Keep enough pooled connections for every transfer thread
+        pool_size = self.transfer.get("s3_max_pool_connections") or (concurrency if concurrency and concurrency > 10 else None)
         self.s3 = boto3.client(
             "s3",
             region_name=kwargs.get("region"),
             aws_access_key_id=kwargs.get("access_key"),
             aws_secret_access_key=kwargs.get("secret_key"),
+            endpoint_url=self.transfer.get("s3_endpoint_url"),
+            config=Config(max_pool_connections=pool_size) if pool_size else None,
         )
+        self.transfer_config = self._build_transfer_config()
+
+    def _build_transfer_config(self) -> "TransferConfig":
+        options = {}
+        if "concurrency" in self.transfer:
+            options["max_concurrency"] = self.transfer["concurrency"]
+        if "part_size_mb" in self.transfer:
+            options["multipart_chunksize"] = self.transfer["part_size_mb"] * MB
+            options["multipart_threshold"] = self.transfer["part_size_mb"] * MB
+        if "chunk_size_kb" in self.transfer:
+            options["io_chunksize"] = self.transfer["chunk_size_kb"] * 1024
+        if "buffer_size_mb" in self.transfer:
+            chunk_size = options.get("io_chunksize", TransferConfig().io_chunksize)
+            options["max_io_queue"] = max(1, self.transfer["buffer_size_mb"] * MB // chunk_size)
+        return TransferConfig(**options)
 
     def _get_prefix(self, model_name: str, version: str = None) -> str:
         p = f"{self.prefix}{model_name}/"
@@ -52,61 +202,198 @@ class S3Storage(StorageBackend):
                 # Prefix is like "repos/model_name/"
                 # Remove self.prefix from start and / from end
                 rel = prefix["Prefix"][len(self.prefix):].rstrip("/")
-                if rel:
+                if rel and not rel.startswith("."):
                     models.append(rel)
         return sorted(models)
 
     def get_model_versions(self, model_name: str) -> List[str]:
+        if not self._uses_markers(model_name):
+            return self._version_prefixes(model_name)
+
+        # Only committed versions: a prefix without a commit marker is still being written
+        # (or was left behind by a failed upload)
+        commits_prefix = self._commits_prefix(model_name)
+        paginator = self.s3.get_paginator("list_objects_v2")
+        iterator = paginator.paginate(Bucket=self.bucket_name, Prefix=commits_prefix)
+
+        versions = []
+        for page in iterator:
+            for obj in page.get("Contents", []):
+                # Key is like "repos/model_name/.aim-commits/v1"
+                rel = obj["Key"][len(commits_prefix):]
+                if rel and "/" not in rel:
+                    versions.append(rel)
+        return sorted(versions)
+
+    def _version_prefixes(self, model_name: str) -> List[str]:
+        """Every version prefix of a model, committed or not."""
         model_prefix = self._get_prefix(model_name)
         paginator = self.s3.get_paginator("list_objects_v2")
         iterator = paginator.paginate(Bucket=self.bucket_name, Prefix=model_prefix, Delimiter="/")
-        
+
         versions = []
         for page in iterator:
-             for prefix in page.get("CommonPrefixes", []):
+            for prefix in page.get("CommonPrefixes", []):
                 # Prefix is like "repos/model_name/v1/"
-                # Remove model_prefix from start
                 rel = prefix["Prefix"][len(model_prefix):].rstrip("/")
-                if rel:
+                if rel and not rel.startswith("."):
                     versions.append(rel)
         return sorted(versions)
 
+    def _uses_markers(self, model_name: str) -> bool:
+        resp = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=self._commits_prefix(model_name), MaxKeys=1)
+        return "Contents" in resp
+
+    def _adopt_legacy_versions(self, model_name: str):
+        """
+        Switch a model pushed before commit markers existed over to markers, by marking each of
+        its existing versions as committed. Must run before anything new is written to the model.
+        """
+        if self._uses_markers(model_name):
+            return
+        for version in self._version_prefixes(model_name):
+            self.s3.put_object(Bucket=self.bucket_name, Key=self._commit_key(model_name, version), Body=b"")
+        # Written last, and also for brand new models: from here on only markers count
+        self.s3.put_object(Bucket=self.bucket_name, Key=self._commits_prefix(model_name), Body=b"")
+
+    def _commits_prefix(self, model_name: str) -> str:
+        return f"{self._get_prefix(model_name)}{COMMITS_DIR}/"
+
+    def _commit_key(self, model_name: str, version: str) -> str:
+        return f"{self._commits_prefix(model_name)}{version}"
+
+    def _is_committed(self, model_name: str, version: str) -> bool:
+        try:
+            self.s3.head_object(Bucket=self.bucket_name, Key=self._commit_key(model_name, version))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("404", "NoSuchKey", "NotFound"):
+                raise
+            if self._uses_markers(model_name):
+                return False
+            resp = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=self._get_prefix(model_name, version), MaxKeys=1)
+            return "Contents" in resp
+        return True
+
+    def _publish(self, model_name: str, version: str, keys: List[str]):
+        """Write the commit marker, or remove the version's objects if that fails."""
+        try:
+            self.s3.put_object(Bucket=self.bucket_name, Key=self._commit_key(model_name, version), Body=b"")
+        except BaseException:
+            self._delete_keys(keys)
+            raise
+
+    def _delete_keys(self, keys: List[str]):
+        # delete_objects takes at most 1000 keys per call
+        for i in range(0, len(keys), 1000):
+            objects = [{"Key": key} for key in keys[i:i + 1000]]
+            self.s3.delete_objects(Bucket=self.bucket_name, Delete={"Objects": objects})
+
     def upload_version(self, model_name: str, version: str, local_path: Path):
         dest_prefix = self._get_prefix(model_name, version)
         
-        # Check if exists (check if any object exists with that prefix)
-        resp = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=dest_prefix, MaxKeys=1)
-        if "Contents" in resp:
+        if self._version_exists(model_name, version):
              raise FileExistsError(f"Version {version} for model {model_name} already exists in S3.")
+        self._adopt_legacy_versions(model_name)
 
         local_path = Path(local_path)
-        for root, dirs, files in os.walk(local_path):
-            for file in files:
-                full_path = Path(root) / file
-                rel_path = full_path.relative_to(local_path)
-                s3_key = f"{dest_prefix}{rel_path}"
-                self.s3.upload_file(str(full_path), self.bucket_name, s3_key)
+        uploaded = []
+        try:
+            for root, dirs, files in os.walk(local_path):
+                for file in files:
+                    full_path = Path(root) / file
+                    rel_path = full_path.relative_to(local_path)
+                    s3_key = f"{dest_prefix}{rel_path}"
+                    uploaded.append(s3_key)
+                    self.s3.upload_file(str(full_path), self.bucket_name, s3_key, Config=self.transfer_config)
+        except BaseException:
+            # Never committed, so readers never saw it; just don't leave the objects behind
+            self._delete_keys(uploaded)
+            raise
+        self._publish(model_name, version, uploaded)
+
+    def _version_exists(self, model_name: str, version: str) -> bool:
+        # Uncommitted objects count too: they belong to another upload in progress
+        resp = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=self._get_prefix(model_name, version), MaxKeys=1)
+        return "Contents" in resp or self._is_committed(model_name, version)
+
+    def begin_version(self, model_name: str, version: str) -> StagedVersion:
+        if self._version_exists(model_name, version):
+            raise FileExistsError(f"Version {version} for model {model_name} already exists in S3.")
+        self._adopt_legacy_versions(model_name)
+        # Stage straight into the version prefix: readers ignore it until the commit marker
+        # exists, and _version_exists keeps other uploads out of it meanwhile
+        return StagedVersion(model_name, version, self._get_prefix(model_name, version))
+
+    def upload_file(self, staged: StagedVersion, rel_path: str, local_file: Path):
+        s3_key = f"{staged.location}{Path(rel_path).as_posix()}"
+        self.s3.upload_file(str(local_file), self.bucket_name, s3_key, Config=self.transfer_config)
+
+    def open_file(self, staged: StagedVersion, rel_path: str, size: Optional[int] = None) -> BinaryIO:
+        part_size = max(MIN_PART_SIZE, self.transfer.get("part_size_mb", DEFAULT_PART_SIZE_MB) * MB)
+        if size is not None:
+            if size > MAX_PARTS * MAX_PART_SIZE:
+                raise ValueError(f"'{rel_path}' is {size} bytes, larger than the largest S3 multipart upload.")
+            # Smallest whole number of MB that fits the object into the part limit
+            part_size = max(part_size, -(-size // (MAX_PARTS * MB)) * MB)
+        return S3MultipartWriter(
+            self.s3,
+            self.bucket_name,
+            f"{staged.location}{Path(rel_path).as_posix()}",
+            part_size,
+            self.transfer.get("concurrency", DEFAULT_PARTS_IN_FLIGHT),
+        )
+
+    def delete_file(self, staged: StagedVersion, rel_path: str):
+        self.s3.delete_object(Bucket=self.bucket_name, Key=f"{staged.location}{Path(rel_path).as_posix()}")
+
+    def _staged_keys(self, staged: StagedVersion) -> List[str]:
+        paginator = self.s3.get_paginator("list_objects_v2")
+        keys = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=staged.location):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        return keys
+
+    def commit_version(self, staged: StagedVersion):
+        # The objects are already in place; the marker alone publishes them
+        if self._is_committed(staged.model_name, staged.version):
+            raise FileExistsError(f"Version {staged.version} for model {staged.model_name} already exists in S3.")
+        self._publish(staged.model_name, staged.version, self._staged_keys(staged))
+
+    def abort_version(self, staged: StagedVersion):
+        # The staging prefix is the version prefix; never delete a version that made it out
+        if self._is_committed(staged.model_name, staged.version):
+            return
+        self._delete_keys(self._staged_keys(staged))
 
     def download_version(self, model_name: str, version: str, dest_path: Path):
         source_prefix = self._get_prefix(model_name, version)
         dest_path = Path(dest_path)
+        if not self._is_committed(model_name, version):
+            raise FileNotFoundError(f"Version {version} for model {model_name} not found in S3.")
         
         paginator = self.s3.get_paginator("list_objects_v2")
         iterator = paginator.paginate(Bucket=self.bucket_name, Prefix=source_prefix)
         
         found = False
-        for page in iterator:
-            for obj in page.get("Contents", []):
-                found = True
-                s3_key = obj["Key"]
-                # s3_key = repos/model/v1/file.txt
-                # rel_path = file.txt
-                rel_path = s3_key[len(source_prefix):]
-                if not rel_path: continue # is the directory itself?
-
-                local_file = dest_path / rel_path
-                local_file.parent.mkdir(parents=True, exist_ok=True)
-                self.s3.download_file(self.bucket_name, s3_key, str(local_file))
+        with self.open_sink() as sink:
+            for page in iterator:
+                for obj in page.get("Contents", []):
+                    found = True
+                    s3_key = obj["Key"]
+                    # s3_key = repos/model/v1/file.txt
+                    # rel_path = file.txt
+                    rel_path = s3_key[len(source_prefix):]
+                    if not rel_path: continue # is the directory itself?
+
+                    local_file = dest_path / rel_path
+                    local_file.parent.mkdir(parents=True, exist_ok=True)
+                    # The sink is not seekable, so boto3 still fetches ranges in parallel
+                    # but hands them over in order
+                    sink.download(
+                        local_file,
+                        obj["Size"],
+                        lambda f: self.s3.download_fileobj(self.bucket_name, s3_key, f, Config=self.transfer_config),
+                    )
         
         if not found:
              raise FileNotFoundError(f"Version {version} for model {model_name} not found in S3.")
@@ -125,11 +412,15 @@ class S3Storage(StorageBackend):
 
     def delete_version(self, model_name: str, version: str):
         version_prefix = self._get_prefix(model_name, version)
-        
+
+        # Unpublish first so readers never see a partially deleted version
+        found = self._is_committed(model_name, version)
+        if found:
+            self.s3.delete_object(Bucket=self.bucket_name, Key=self._commit_key(model_name, version))
+
         paginator = self.s3.get_paginator("list_objects_v2")
         iterator = paginator.paginate(Bucket=self.bucket_name, Prefix=version_prefix)
         
-        found = False
         for page in iterator:
             if "Contents" in page:
                 found = True
@@ -1,10 +1,15 @@
 import os
 import paramiko
+import shutil
 import stat
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, List, Optional, Tuple
 from urllib.parse import urlparse
-from .base import StorageBackend
+from .base import StorageBackend, StagedVersion
+from .sink import LocalWriteSink
 
 class SFTPStorage(StorageBackend):
     def __init__(self, path: str, **kwargs):
@@ -29,6 +34,11 @@ class SFTPStorage(StorageBackend):
         elif not self.remote_root.endswith("/"):
              self.remote_root += "/"
 
+        # One SFTP channel per calling thread, all over the same SSH connection
+        self._local = threading.local()
+        self._channels = []
+        self._channels_lock = threading.Lock()
+
         self.ssh = paramiko.SSHClient()
         self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         
@@ -44,13 +54,90 @@ class SFTPStorage(StorageBackend):
                 connect_params["key_filename"] = self.key_filename
                 
             self.ssh.connect(**connect_params)
-            self.sftp = self.ssh.open_sftp()
+            self.sftp  # Open the first channel now so connection problems surface here
         except Exception as e:
             raise ConnectionError(f"Failed to connect to SFTP server: {e}")
 
+    @property
+    def sftp(self) -> paramiko.SFTPClient:
+        """
+        The calling thread's SFTP channel. A channel keeps a working directory and serves one
+        request stream, so threads sharing this backend (e.g. `aim install`) each get their own.
+        """
+        channel = getattr(self._local, "sftp", None)
+        if channel is None:
+            channel = self._open_channel()
+            self._local.sftp = channel
+            with self._channels_lock:
+                self._channels.append(channel)
+        return channel
+
+    def _open_channel(self) -> paramiko.SFTPClient:
+        """Open an SFTP session on the shared SSH transport using the tuned window/packet sizes."""
+        window_size = self.transfer.get("sftp_window_size_mb")
+        max_packet_size = self.transfer.get("sftp_max_packet_kb")
+        return paramiko.SFTPClient.from_transport(
+            self.ssh.get_transport(),
+            window_size=window_size * 1024 * 1024 if window_size else None,
+            max_packet_size=max_packet_size * 1024 if max_packet_size else None,
+        )
+
+    def _run_transfers(self, transfers: List[Tuple[str, str, str, Optional[int]]], sink: Optional[LocalWriteSink] = None):
+        """
+        Run (direction, local_path, remote_path, size) transfers; downloads are written through sink. With concurrency > 1 each worker
+        gets its own SFTP channel over the same SSH connection to hide per-request latency.
+        """
+        concurrency = self.transfer.get("concurrency", 1)
+        if concurrency <= 1 or len(transfers) <= 1:
+            for transfer in transfers:
+                self._transfer(self.sftp, *transfer, sink=sink)
+            return
+
+        local = threading.local()
+        channels = []
+        channels_lock = threading.Lock()
+
+        def run(transfer):
+            if not hasattr(local, "sftp"):
+                local.sftp = self._open_channel()
+                with channels_lock:
+                    channels.append(local.sftp)
+            self._transfer(local.sftp, *transfer, sink=sink)
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(run, t) for t in transfers]
+                for future in futures:
+                    future.result()
+        finally:
+            for channel in channels:
+                channel.close()
+
+    def _transfer(
+        self,
+        sftp: paramiko.SFTPClient,
+        direction: str,
+        local_path: str,
+        remote_path: str,
+        size: Optional[int] = None,
+        sink: Optional[LocalWriteSink] = None,
+    ):
+        buffer_size = self.transfer.get("buffer_size_mb")
+        if direction == "put":
+            if buffer_size:
+                with open(local_path, "rb") as fl, sftp.open(remote_path, "wb", bufsize=buffer_size * 1024 * 1024) as fr:
+                    fr.set_pipelined(True)
+                    shutil.copyfileobj(fl, fr, 1024 * 1024)
+            else:
+                sftp.put(local_path, remote_path)
+        elif sink is not None:
+            sink.download(Path(local_path), size, lambda f: sftp.getfo(remote_path, f))
+        else:
+            sftp.get(remote_path, local_path)
+
     def __del__(self):
-        if hasattr(self, "sftp"):
-            self.sftp.close()
+        for channel in getattr(self, "_channels", []):
+            channel.close()
         if hasattr(self, "ssh"):
             self.ssh.close()
 
@@ -66,7 +153,7 @@ class SFTPStorage(StorageBackend):
         try:
             return [
                 f for f in self.sftp.listdir(remote_path)
-                if self._is_dir(remote_path, f)
+                if not f.startswith(".") and self._is_dir(remote_path, f)
             ]
         except FileNotFoundError:
             return []
@@ -119,7 +206,8 @@ class SFTPStorage(StorageBackend):
 
         local_path = Path(local_path)
         
-        # Walk local
+        # Walk local, creating remote directories up front so files can go in parallel
+        transfers = []
         for root, dirs, files in os.walk(local_path):
             for file in files:
                 full_local_path = Path(root) / file
@@ -130,7 +218,58 @@ class SFTPStorage(StorageBackend):
                 remote_dir = os.path.dirname(remote_file_path)
                 
                 self._mkdir_p(remote_dir)
-                self.sftp.put(str(full_local_path), remote_file_path)
+                transfers.append(("put", str(full_local_path), remote_file_path, None))
+
+        self._run_transfers(transfers)
+
+    def begin_version(self, model_name: str, version: str) -> StagedVersion:
+        try:
+            self.sftp.stat(self._get_remote_path(model_name, version))
+            raise FileExistsError(f"Version {version} for model {model_name} already exists on SFTP.")
+        except FileNotFoundError:
+            pass
+        # Hidden staging directory next to the versions
+        staging = f"{self._get_remote_path(model_name)}.staging-{version}-{uuid.uuid4().hex[:8]}"
+        self._mkdir_p(staging)
+        return StagedVersion(model_name, version, staging)
+
+    def upload_file(self, staged: StagedVersion, rel_path: str, local_file: Path):
+        remote_file_path = f"{staged.location}/{Path(rel_path).as_posix()}"
+        self._mkdir_p(os.path.dirname(remote_file_path))
+        self._transfer(self.sftp, "put", str(local_file), remote_file_path)
+
+    def open_file(self, staged: StagedVersion, rel_path: str, size: Optional[int] = None) -> BinaryIO:
+        remote_file_path = f"{staged.location}/{Path(rel_path).as_posix()}"
+        self._mkdir_p(os.path.dirname(remote_file_path))
+        buffer_size = self.transfer.get("buffer_size_mb")
+        remote_file = self.sftp.open(remote_file_path, "wb", bufsize=buffer_size * 1024 * 1024 if buffer_size else -1)
+        # Don't wait for each write to be acknowledged; paramiko's channel window bounds what is in flight
+        remote_file.set_pipelined(True)
+        return remote_file
+
+    def delete_file(self, staged: StagedVersion, rel_path: str):
+        try:
+            self.sftp.remove(f"{staged.location}/{Path(rel_path).as_posix()}")
+        except FileNotFoundError:
+            pass
+
+    def commit_version(self, staged: StagedVersion):
+        dest_remote = self._get_remote_path(staged.model_name, staged.version).rstrip("/")
+        try:
+            # SFTP rename refuses an existing target, so a concurrent push cannot be clobbered
+            self.sftp.rename(staged.location, dest_remote)
+        except IOError:
+            try:
+                self.sftp.stat(dest_remote)
+            except FileNotFoundError:
+                raise
+            raise FileExistsError(f"Version {staged.version} for model {staged.model_name} already exists on SFTP.")
+
+    def abort_version(self, staged: StagedVersion):
+        try:
+            self._rmtree(staged.location)
+        except FileNotFoundError:
+            pass
 
     def download_version(self, model_name: str, version: str, dest_path: Path):
         source_remote = self._get_remote_path(model_name, version)
@@ -142,10 +281,13 @@ class SFTPStorage(StorageBackend):
             raise FileNotFoundError(f"Version {version} for model {model_name} not found on SFTP.")
 
         # Recursive download is tricky with paramiko, need to walk remote
-        # A simple recursive walker
-        self._download_dir(source_remote, dest_path)
+        # A simple recursive walker collects the files, then they are fetched
+        transfers = []
+        self._download_dir(source_remote, dest_path, transfers)
+        with self.open_sink() as sink:
+            self._run_transfers(transfers, sink)
 
-    def _download_dir(self, remote_dir: str, local_dir: Path):
+    def _download_dir(self, remote_dir: str, local_dir: Path, transfers: List[Tuple[str, str, str, Optional[int]]]):
         local_dir.mkdir(parents=True, exist_ok=True)
         
         for item in self.sftp.listdir_attr(remote_dir):
@@ -153,9 +295,9 @@ class SFTPStorage(StorageBackend):
             local_path = local_dir / item.filename
             
             if stat.S_ISDIR(item.st_mode):
-                self._download_dir(remote_path, local_path)
+                self._download_dir(remote_path, local_path, transfers)
             else:
-                self.sftp.get(remote_path, str(local_path))
+                transfers.append(("get", str(local_path), remote_path, item.st_size))
 
     def _rmtree(self, remote_path):
         """Recursively delete a directory tree on remote."""
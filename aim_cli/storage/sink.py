@@ -0,0 +1,246 @@
+import ctypes
+import ctypes.util
+import io
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+CACHE_MODES = ("keep", "drop", "warm")
+
+MB = 1024 * 1024
+DEFAULT_WRITE_BLOCK_MB = 8
+DEFAULT_FSYNC_BATCH_MB = 1024
+# In drop mode, written pages are flushed and evicted in windows of this size
+DROP_WINDOW = 64 * MB
+# Reserve blocks without changing the file size, so an interrupted download is visibly short
+FALLOC_FL_KEEP_SIZE = 1
+
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        _libc.fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    except (OSError, AttributeError):
+        _libc = None
+
+
+def _fallocate(fd: int, size: int) -> bool:
+    """
+    Reserve size bytes for fd in as few extents as possible. Uses fallocate(2) directly,
+    since posix_fallocate falls back to writing every block on filesystems without support.
+    """
+    if _libc is None or size <= 0:
+        return False
+    return _libc.fallocate(fd, FALLOC_FL_KEEP_SIZE, 0, size) == 0
+
+
+def _fadvise(fd: int, offset: int, length: int, advice_name: str):
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, advice)
+    except OSError:
+        pass
+
+
+class SinkFile(io.RawIOBase):
+    """
+    A file being downloaded through a LocalWriteSink. Sequential, write-only, not seekable:
+    writes are coalesced into write_block sized chunks so the file is written in large,
+    block-aligned pieces.
+    """
+
+    def __init__(self, sink: "LocalWriteSink", path: Path, size: Optional[int]):
+        super().__init__()
+        self.sink = sink
+        self.path = Path(path)
+        self.expected_size = size
+        self._buffer = bytearray()
+        self._position = 0
+        self._dropped = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self._preallocated = bool(size) and sink.preallocate and _fallocate(self._fd, size)
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        view = memoryview(data)
+        self._buffer += view
+        self._position += view.nbytes
+        if len(self._buffer) >= self.sink.write_block:
+            whole = len(self._buffer) - len(self._buffer) % self.sink.write_block
+            self._write_out(whole)
+        return view.nbytes
+
+    def _write_out(self, length: int):
+        view = memoryview(self._buffer)[:length]
+        try:
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+        finally:
+            view.release()
+        del self._buffer[:length]
+
+        if self.sink.cache_mode == "drop":
+            flushed = self._position - len(self._buffer)
+            if flushed - self._dropped >= DROP_WINDOW:
+                # Dirty pages cannot be dropped, so write them back first
+                os.fdatasync(self._fd)
+                _fadvise(self._fd, self._dropped, flushed - self._dropped, "POSIX_FADV_DONTNEED")
+                self._dropped = flushed
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._write_out(len(self._buffer))
+            if self._preallocated and self._position < self.expected_size:
+                # The source turned out smaller than announced; release the unused reservation
+                # past the end of the file
+                os.ftruncate(self._fd, self._position)
+            if self.sink.cache_mode == "drop":
+                os.fdatasync(self._fd)
+                _fadvise(self._fd, 0, 0, "POSIX_FADV_DONTNEED")
+        finally:
+            os.close(self._fd)
+            super().close()
+        self.sink._finished(self.path, self._position)
+
+    def abort(self):
+        """Close and remove a partially written file."""
+        if self.closed:
+            return
+        os.close(self._fd)
+        super().close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class LocalWriteSink:
+    """
+    Destination for files downloaded by any backend.
+
+    - preallocates each file with fallocate when its size is known, to avoid fragmenting
+      the filesystem with many interleaved large downloads
+    - coalesces writes into large aligned blocks
+    - cache_mode 'drop' evicts written pages as it goes (posix_fadvise DONTNEED) so a
+      running inference server keeps its page cache; 'warm' asks the kernel to keep/read
+      the files into the cache once the download finishes, for an imminent model load
+    - fsyncs in batches of fsync_batch bytes rather than once per file
+    """
+
+    def __init__(
+        self,
+        cache_mode: str = "keep",
+        write_block: int = DEFAULT_WRITE_BLOCK_MB * MB,
+        fsync_batch: int = DEFAULT_FSYNC_BATCH_MB * MB,
+        preallocate: bool = True,
+    ):
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{cache_mode}'. Must be one of {', '.join(CACHE_MODES)}.")
+        self.cache_mode = cache_mode
+        self.write_block = max(1, write_block)
+        self.fsync_batch = fsync_batch
+        self.preallocate = preallocate
+        self._lock = threading.Lock()
+        self._unsynced: List[Path] = []
+        self._unsynced_bytes = 0
+        self._finished_files: List[Tuple[Path, int]] = []
+
+    @classmethod
+    def from_transfer(cls, transfer: dict) -> "LocalWriteSink":
+        """Build a sink from a repo's transfer profile (see TransferConfig)."""
+        return cls(
+            cache_mode=transfer.get("cache_mode", "keep"),
+            write_block=transfer.get("write_block_mb", DEFAULT_WRITE_BLOCK_MB) * MB,
+            fsync_batch=transfer.get("fsync_batch_mb", DEFAULT_FSYNC_BATCH_MB) * MB,
+            preallocate=transfer.get("preallocate", True),
+        )
+
+    def open(self, path: Path, size: Optional[int] = None) -> SinkFile:
+        """Open a file for writing; pass size when known so it can be preallocated."""
+        return SinkFile(self, path, size)
+
+    def download(self, path: Path, size: Optional[int], fill: Callable[[SinkFile], None]):
+        """Create path and let fill() stream the content into it; a failed fill leaves no file behind."""
+        f = self.open(path, size)
+        try:
+            fill(f)
+        except BaseException:
+            f.abort()
+            raise
+        f.close()
+
+    def _finished(self, path: Path, size: int):
+        with self._lock:
+            self._unsynced.append(path)
+            self._unsynced_bytes += size
+            self._finished_files.append((path, size))
+            if self._unsynced_bytes < self.fsync_batch:
+                return
+            batch, self._unsynced, self._unsynced_bytes = self._unsynced, [], 0
+        self._fsync(batch)
+
+    @staticmethod
+    def _fsync(paths: List[Path]):
+        # fsync through a fresh descriptor flushes everything written via any descriptor
+        dirs: Set[Path] = set()
+        for path in paths:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            dirs.add(path.parent)
+        # Make the new directory entries durable too
+        for directory in dirs:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def close(self):
+        """Fsync what is left of the current batch and pre-warm files in 'warm' mode."""
+        with self._lock:
+            batch, self._unsynced, self._unsynced_bytes = self._unsynced, [], 0
+            finished, self._finished_files = self._finished_files, []
+        if batch:
+            self._fsync(batch)
+        if self.cache_mode == "warm":
+            for path, size in finished:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    _fadvise(fd, 0, size, "POSIX_FADV_WILLNEED")
+                finally:
+                    os.close(fd)
+
+    def __enter__(self) -> "LocalWriteSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
@@ -0,0 +1,286 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+from .base import StorageBackend, StagedVersion
+from .local import LocalStorage
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+STATS_FILE_NAME = ".aim-tiers.json"
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            total += os.lstat(os.path.join(root, file)).st_size
+    return total
+
+
+class TieredStorage(StorageBackend):
+    """
+    Combines a fast local/NFS tier with a cold remote tier (S3 or SFTP).
+
+    The cold tier is the source of truth: pushes go there and every version stays there.
+    Versions pulled at least `promote_after` times within `promote_window_days` are copied
+    into the hot tier, and hot copies are dropped again when idle for `demote_after_days`
+    or when the hot tier exceeds `hot_capacity_gb` (least recently pulled first).
+    """
+
+    def __init__(
+        self,
+        hot: LocalStorage,
+        cold: StorageBackend,
+        hot_capacity_gb: Optional[float] = None,
+        promote_after: int = 3,
+        promote_window_days: float = 7,
+        demote_after_days: float = 14,
+        **kwargs,
+    ):
+        super().__init__(hot.path, **kwargs)
+        self.hot = hot
+        self.cold = cold
+        self.hot_capacity_bytes = int(hot_capacity_gb * 1024 ** 3) if hot_capacity_gb else None
+        self.promote_after = promote_after
+        self.promote_window = promote_window_days * DAY_SECONDS
+        self.demote_after = demote_after_days * DAY_SECONDS
+        self.stats_path = self.hot.root_path / STATS_FILE_NAME
+
+    # --- access statistics ---
+
+    @contextmanager
+    def _stats(self):
+        """Load the stats file under an exclusive lock and write it back on exit."""
+        lock_path = self.stats_path.with_suffix(".lock")
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                stats = {}
+                if self.stats_path.exists():
+                    try:
+                        with open(self.stats_path, "r") as f:
+                            stats = json.load(f)
+                    except ValueError:
+                        stats = {}  # Corrupt stats only cost us some promotion history
+                yield stats
+                tmp_path = self.stats_path.with_suffix(".tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(stats, f, indent=1, sort_keys=True)
+                os.replace(tmp_path, self.stats_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _key(model_name: str, version: str) -> str:
+        return f"{model_name}/{version}"
+
+    def _record_pull(self, model_name: str, version: str) -> bool:
+        """Record a pull and return whether the version is now hot enough to promote."""
+        now = time.time()
+        with self._stats() as stats:
+            entry = stats.setdefault(self._key(model_name, version), {"pulls": []})
+            entry["pulls"] = [t for t in entry["pulls"] if now - t < self.promote_window] + [now]
+            entry["last_access"] = now
+            # A version that alone exceeds the budget would be evicted right after promotion
+            if self.hot_capacity_bytes is not None and entry.get("size", 0) > self.hot_capacity_bytes:
+                return False
+            return len(entry["pulls"]) >= self.promote_after
+
+    def _record_size(self, model_name: str, version: str, size: int):
+        with self._stats() as stats:
+            stats.setdefault(self._key(model_name, version), {"pulls": []})["size"] = size
+
+    def _in_hot(self, model_name: str, version: str) -> bool:
+        return (self.hot._model_path(model_name) / version).is_dir()
+
+    # --- promotion / demotion ---
+
+    def _promote(self, model_name: str, version: str) -> str:
+        """Copy a version from the cold tier into the hot tier, publishing it atomically. Returns its key."""
+        model_path = self.hot._model_path(model_name)
+        model_path.mkdir(parents=True, exist_ok=True)
+        # Unique per call: install workers in one process may promote the same version at once
+        staging = model_path / f".promote-{version}-{uuid.uuid4().hex[:8]}"
+        try:
+            self.cold.download_version(model_name, version, staging)
+            os.rename(staging, model_path / version)
+        except OSError:
+            # Another process promoted it first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not self._in_hot(model_name, version):
+                raise
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        size = _dir_size(model_path / version)
+        with self._stats() as stats:
+            entry = stats.setdefault(self._key(model_name, version), {"pulls": []})
+            entry["hot"] = True
+            entry["size"] = size
+        return self._key(model_name, version)
+
+    def _unpublish_hot(self, model_name: str, version: str) -> Optional[Path]:
+        """
+        Take a hot copy out of view with a single rename, so a concurrent pull sees either the
+        whole version or none of it. Returns the hidden directory left to delete, if any.
+        """
+        model_path = self.hot._model_path(model_name)
+        trash = model_path / f".demote-{version}-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(model_path / version, trash)
+        except FileNotFoundError:
+            # Another process demoted it first
+            return None
+        return trash
+
+    def _pick_demotions(self, stats: dict, keep: Optional[str], demotable: Optional[set] = None) -> List[str]:
+        """Idle hot versions, then least recently pulled ones until the hot tier fits its budget."""
+        now = time.time()
+        hot_keys = [
+            k for k, v in stats.items()
+            if v.get("hot") and self._in_hot(*k.split("/", 1))
+        ]
+        # Least recently pulled first
+        hot_keys.sort(key=lambda k: stats[k].get("last_access", 0))
+        total = sum(stats[k].get("size", 0) for k in hot_keys)
+
+        picked = []
+        for key in hot_keys:
+            if demotable is not None and key not in demotable:
+                continue
+            idle = now - stats[key].get("last_access", 0) > self.demote_after
+            over_budget = (
+                self.hot_capacity_bytes is not None and total > self.hot_capacity_bytes and key != keep
+            )
+            if idle or over_budget:
+                picked.append(key)
+                total -= stats[key].get("size", 0)
+        return picked
+
+    def rebalance(self, keep: Optional[str] = None, dry_run: bool = False) -> List[str]:
+        """
+        Demote idle versions and enforce the hot capacity budget. Returns demoted keys, or with
+        dry_run the keys that would be demoted. The version under `keep` (just promoted) is not
+        evicted for the budget.
+
+        The stats lock is only held to choose versions and rename them away: the cold tier is
+        asked beforehand and the hot copies are deleted afterwards, so pulls are not blocked.
+        """
+        with self._stats() as stats:
+            candidates = self._pick_demotions(stats, keep)
+        if not candidates:
+            return []
+
+        # Never drop the only copy of a version
+        demotable = set()
+        for model_name in {key.split("/", 1)[0] for key in candidates}:
+            demotable.update(self._key(model_name, v) for v in self.cold.get_model_versions(model_name))
+
+        demoted = []
+        trash = []
+        with self._stats() as stats:
+            for key in self._pick_demotions(stats, keep, demotable):
+                demoted.append(key)
+                if dry_run:
+                    continue
+                path = self._unpublish_hot(*key.split("/", 1))
+                if path is not None:
+                    trash.append(path)
+                stats[key]["hot"] = False
+        for path in trash:
+            shutil.rmtree(path)
+        return demoted
+
+    def tier_status(self) -> Dict[str, dict]:
+        with self._stats() as stats:
+            return {
+                k: {**v, "hot": self._in_hot(*k.split("/", 1))}
+                for k, v in stats.items()
+            }
+
+    # --- StorageBackend ---
+
+    def list_models(self) -> List[str]:
+        return sorted(set(self.hot.list_models()) | set(self.cold.list_models()))
+
+    def get_model_versions(self, model_name: str) -> List[str]:
+        return sorted(set(self.hot.get_model_versions(model_name)) | set(self.cold.get_model_versions(model_name)))
+
+    def upload_version(self, model_name: str, version: str, local_path: Path):
+        if self._in_hot(model_name, version):
+            raise FileExistsError(f"Version {version} for model {model_name} already exists.")
+        self.cold.upload_version(model_name, version, local_path)
+
+    def begin_version(self, model_name: str, version: str) -> StagedVersion:
+        if self._in_hot(model_name, version):
+            raise FileExistsError(f"Version {version} for model {model_name} already exists.")
+        return self.cold.begin_version(model_name, version)
+
+    def upload_file(self, staged: StagedVersion, rel_path: str, local_file: Path):
+        self.cold.upload_file(staged, rel_path, local_file)
+
+    def open_file(self, staged: StagedVersion, rel_path: str, size: Optional[int] = None) -> BinaryIO:
+        return self.cold.open_file(staged, rel_path, size)
+
+    def delete_file(self, staged: StagedVersion, rel_path: str):
+        self.cold.delete_file(staged, rel_path)
+
+    def commit_version(self, staged: StagedVersion):
+        self.cold.commit_version(staged)
+
+    def abort_version(self, staged: StagedVersion):
+        self.cold.abort_version(staged)
+
+    def download_version(self, model_name: str, version: str, dest_path: Path, link_mode: str = "copy") -> str:
+        if link_mode == "symlink":
+            # Hot copies come and go, a symlink into the hot tier would dangle after demotion
+            raise ValueError("Link mode 'symlink' is not supported for tiered repos.")
+        promote = self._record_pull(model_name, version)
+
+        promoted = None
+        if not self._in_hot(model_name, version):
+            if not promote:
+                fresh = not Path(dest_path).exists()
+                self.cold.download_version(model_name, version, dest_path)
+                if fresh:
+                    # Lets an oversized version be recognised before it is ever promoted
+                    self._record_size(model_name, version, _dir_size(Path(dest_path)))
+                self.rebalance()
+                return "copy"
+            # Pull once over the slow link into the hot tier, then serve from there
+            promoted = self._promote(model_name, version)
+
+        used_mode = self.hot.download_version(model_name, version, dest_path, link_mode=link_mode)
+        self.rebalance(keep=promoted)
+        return used_mode
+
+    def delete_model(self, model_name: str):
+        self.hot.delete_model(model_name)
+        self.cold.delete_model(model_name)
+        with self._stats() as stats:
+            for key in [k for k in stats if k.split("/", 1)[0] == model_name]:
+                del stats[key]
+
+    def delete_version(self, model_name: str, version: str):
+        in_hot = self._in_hot(model_name, version)
+        if in_hot:
+            self.hot.delete_version(model_name, version)
+        try:
+            self.cold.delete_version(model_name, version)
+        except FileNotFoundError:
+            if not in_hot:
+                raise
+        with self._stats() as stats:
+            stats.pop(self._key(model_name, version), None)
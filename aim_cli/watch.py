@@ -0,0 +1,177 @@
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+DEFAULT_MARKER = ".aim-complete"
+
+
+class DirectoryWatcher:
+    """
+    Reports files under root that may have been written since the last call.
+
+    Uses inotify (via the optional `inotify_simple` package) when available, reporting
+    files on close-after-write or rename-into-place; otherwise falls back to polling,
+    where every file is reported on every call and the caller compares sizes/mtimes.
+    """
+
+    def __init__(self, root: Path, poll_interval: float = 1.0, use_inotify: bool = True):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self.inotify = None
+        self._watches: Dict[int, Path] = {}
+        if use_inotify and INotify is not None:
+            try:
+                self.inotify = INotify()
+            except OSError:
+                self.inotify = None  # Out of inotify instances, or not Linux
+        if self.inotify is not None:
+            self._pending = self._add_tree(self.root)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.inotify is not None else "polling"
+
+    def _add_tree(self, directory: Path) -> Set[str]:
+        """Watch directory and its subdirectories; returns files already present in them."""
+        found = set()
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+        for root, dirs, files in os.walk(directory):
+            wd = self.inotify.add_watch(root, mask)
+            self._watches[wd] = Path(root)
+            for file in files:
+                found.add((Path(root) / file).relative_to(self.root).as_posix())
+        return found
+
+    def scan(self) -> Set[str]:
+        files = set()
+        for root, dirs, names in os.walk(self.root):
+            for name in names:
+                files.add((Path(root) / name).relative_to(self.root).as_posix())
+        return files
+
+    def poll(self) -> Set[str]:
+        """Block for up to poll_interval and return relative paths worth checking."""
+        if self.inotify is None:
+            time.sleep(self.poll_interval)
+            return self.scan()
+
+        changed, self._pending = self._pending, set()
+        for event in self.inotify.read(timeout=int(self.poll_interval * 1000)):
+            parent = self._watches.get(event.wd)
+            if parent is None or not event.name:
+                continue
+            path = parent / event.name
+            if event.mask & flags.ISDIR:
+                # Files may land in a new directory before its watch is added
+                if path.is_dir():
+                    changed |= self._add_tree(path)
+            elif event.mask & (flags.CLOSE_WRITE | flags.MOVED_TO):
+                changed.add(path.relative_to(self.root).as_posix())
+        return changed
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def watch_and_push(
+    storage,
+    model_name: str,
+    version: str,
+    local_path: Path,
+    marker: str = DEFAULT_MARKER,
+    settle: float = 2.0,
+    poll_interval: float = 1.0,
+    timeout: Optional[float] = None,
+    on_upload: Optional[Callable[[str], None]] = None,
+    use_inotify: bool = True,
+):
+    """
+    Upload files from local_path as they are finished and commit the version once the
+    marker file appears. A file counts as finished when its size and mtime have not
+    changed for `settle` seconds; files rewritten after upload are uploaded again.
+    """
+    local_path = Path(local_path)
+    deadline = time.monotonic() + timeout if timeout else None
+    while not local_path.is_dir():
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for '{local_path}' to appear.")
+        time.sleep(poll_interval)
+
+    watcher = DirectoryWatcher(local_path, poll_interval=poll_interval, use_inotify=use_inotify)
+    staged = storage.begin_version(model_name, version)
+    uploaded: Dict[str, Tuple[int, int]] = {}
+    # rel path -> (signature, monotonic time it was first seen with that signature)
+    candidates: Dict[str, Tuple[Tuple[int, int], float]] = {}
+    try:
+        # Anything written before we started watching
+        changed = watcher.scan()
+        while True:
+            now = time.monotonic()
+            for rel in changed:
+                if rel == marker:
+                    continue
+                sig = _signature(local_path / rel)
+                if sig is None or uploaded.get(rel) == sig:
+                    continue
+                if rel not in candidates or candidates[rel][0] != sig:
+                    candidates[rel] = (sig, now)
+
+            for rel, (sig, since) in list(candidates.items()):
+                current = _signature(local_path / rel)
+                if current is None:
+                    del candidates[rel]  # Temporary file that was removed or renamed
+                elif current != sig:
+                    candidates[rel] = (current, now)
+                elif now - since >= settle:
+                    storage.upload_file(staged, rel, local_path / rel)
+                    # Only trust the upload if the file did not change while it was read
+                    if _signature(local_path / rel) == sig:
+                        uploaded[rel] = sig
+                        del candidates[rel]
+                        if on_upload:
+                            on_upload(rel)
+
+            if deadline and time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for completion marker '{marker}'.")
+
+            if (local_path / marker).exists():
+                # Catch anything the events missed before publishing
+                missing = {
+                    rel for rel in watcher.scan()
+                    if rel != marker and uploaded.get(rel) != _signature(local_path / rel)
+                }
+                if not missing and not candidates:
+                    break
+                changed = missing
+                time.sleep(min(settle, poll_interval))
+                continue
+
+            changed = watcher.poll()
+
+        # Temporary files that were uploaded and later removed/renamed away
+        for rel in list(uploaded):
+            if not (local_path / rel).exists():
+                storage.delete_file(staged, rel)
+                del uploaded[rel]
+        storage.commit_version(staged)
+    except BaseException:
+        storage.abort_version(staged)
+        raise
+    finally:
+        watcher.close()
+    return sorted(uploaded)
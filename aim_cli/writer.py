@@ -0,0 +1,130 @@
+import io
+from typing import List, Optional, Tuple, Union
+from aim_cli.config import load_config
+from aim_cli.storage.base import StorageBackend
+
+
+class VersionWriter:
+    """
+    Streams the files of a new model version straight to a repository.
+
+    Files are written into the backend's hidden staging area (S3 multipart parts
+    uploaded in the background, pipelined SFTP writes, or plain local files) and the
+    version is published atomically by close(). Leaving the `with` block through an
+    exception discards everything instead.
+    """
+
+    def __init__(self, storage: StorageBackend, model_name: str, version: str):
+        self.storage = storage
+        self.model_name = model_name
+        self.version = version
+        self._staged = storage.begin_version(model_name, version)
+        # (stream handed to the caller, underlying backend stream)
+        self._files: List[Tuple[io.IOBase, io.IOBase]] = []
+        self._done = False
+
+    def open(self, rel_path: str, mode: str = "wb", encoding: str = "utf-8", size: Optional[int] = None):
+        """
+        Open a file of the version for writing. Supports 'wb' and text mode 'w'.
+        Pass the expected size in bytes for very large files so S3 can pick a fitting part size.
+        """
+        if self._done:
+            raise ValueError("Version writer is already closed.")
+        if mode not in ("wb", "w"):
+            raise ValueError(f"Unsupported mode '{mode}'. Use 'wb' or 'w'.")
+
+        raw = self.storage.open_file(self._staged, rel_path, size)
+        # Same write() semantics whatever the backend stream is
+        stream = _RawAdapter(raw)
+        if mode == "w":
+            stream = io.TextIOWrapper(io.BufferedWriter(stream), encoding=encoding)
+        self._files.append((stream, raw))
+        return stream
+
+    def close(self):
+        """Finish every open file and publish the version."""
+        if self._done:
+            return
+        try:
+            for stream, raw in self._files:
+                stream.close()
+            self.storage.commit_version(self._staged)
+        except BaseException:
+            self.abort()
+            raise
+        self._done = True
+
+    def abort(self):
+        """Discard all files written so far; the version is never published."""
+        if self._done:
+            return
+        self._done = True
+        for stream, raw in self._files:
+            try:
+                # Closing would complete pending S3 multipart uploads; abort them instead
+                if hasattr(raw, "abort"):
+                    raw.abort()
+                else:
+                    raw.close()
+            except Exception:
+                pass
+        self.storage.abort_version(self._staged)
+
+    def __enter__(self) -> "VersionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class _RawAdapter(io.RawIOBase):
+    """Presents any backend stream as a standard raw stream so it can be buffered/text-wrapped."""
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def write(self, data) -> int:
+        # paramiko's SFTPFile.write returns None; backend streams always write everything
+        size = memoryview(data).nbytes
+        self.stream.write(data)
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.stream.close()
+        super().close()
+
+
+def open_writer(repo: Union[str, StorageBackend], model_name: str, version: str) -> VersionWriter:
+    """
+    Start writing a new version without staging it on local disk.
+
+        with open_writer("team-vision-repo", "resnet50", "v3") as w:
+            with w.open("model.safetensors", "wb") as f:
+                f.write(data)
+
+    `repo` is the name of a repo in model_repos.yaml or an already built storage backend.
+    """
+    if isinstance(repo, str):
+        # Imported here so using the API does not pull in the CLI modules up front
+        from aim_cli.commands.model import build_storage
+
+        config = load_config()
+        repo_config = config.get_repo(repo)
+        if not repo_config:
+            raise ValueError(f"Repo '{repo}' not found.")
+        storage = build_storage(repo_config, config)
+    else:
+        storage = repo
+    return VersionWriter(storage, model_name, version)